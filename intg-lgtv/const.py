@@ -2,6 +2,7 @@
 
 import asyncio
 from enum import IntEnum
+from sys import intern
 from xmlrpc.client import ProtocolError
 
 from aiohttp import ServerTimeoutError
@@ -13,7 +14,8 @@ from websockets.exceptions import ConnectionClosed, ConnectionClosedOK
 
 LIVE_TV_APP_ID = "com.webos.app.livetv"
 
-LG_FEATURES = [
+# Ordered features used to register the media player entity
+LG_FEATURES: tuple[Features, ...] = (
     Features.ON_OFF,
     Features.TOGGLE,
     Features.VOLUME,
@@ -44,8 +46,8 @@ LG_FEATURES = [
     Features.SUBTITLE,
     Features.RECORD,
     Features.SETTINGS,
-    Features.SELECT_SOUND_MODE
-]
+    Features.SELECT_SOUND_MODE,
+)
 
 WEBOSTV_EXCEPTIONS = (
     OSError,
@@ -60,6 +62,21 @@ WEBOSTV_EXCEPTIONS = (
     ServerTimeoutError,
 )
 
+# Same exceptions except the task cancellation, for handlers which must let cancellations propagate.
+# TimeoutError raised by the library is still caught: an asyncio.timeout() deadline cancels the awaited call
+# first and raises TimeoutError only when leaving its context, so the deadline itself still propagates.
+WEBOSTV_ERRORS = (
+    OSError,
+    ConnectionClosed,
+    ConnectionClosedOK,
+    ConnectionRefusedError,
+    WebOsTvCommandError,
+    TimeoutError,
+    TransportError,
+    ProtocolError,
+    ServerTimeoutError,
+)
+
 LG_SOUND_OUTPUTS: dict[str, str] = {
     "tv_speaker":"Internal TV speaker",
     "external_optical":"Optical",
@@ -78,8 +95,8 @@ LG_SIMPLE_COMMANDS_CUSTOM = [
     "INPUT_SOURCE"  # Next input source
 ]
 
-# Simple commands for both media and remote entities
-LG_SIMPLE_COMMANDS = [
+# Simple commands for both media and remote entities (ordered as exposed to the entities)
+LG_SIMPLE_COMMANDS_ORDERED: tuple[str, ...] = (
     "ASTERISK",
     "3D_MODE",
     "AD",  # Audio Description toggle
@@ -104,611 +121,108 @@ LG_SIMPLE_COMMANDS = [
     "SCREEN_REMOTE",  # Screen Remote
     "TELETEXT",
     "TEXTOPTION",
-    *LG_SIMPLE_COMMANDS_CUSTOM
-]
+    *LG_SIMPLE_COMMANDS_CUSTOM,
+)
+
+LG_SIMPLE_COMMANDS: frozenset[str] = frozenset(map(intern, LG_SIMPLE_COMMANDS_ORDERED))
+
+LG_REMOTE_BUTTONS_BY_BUTTON: dict[Buttons, dict] = {
+    Buttons.BACK: {"short_press": {"cmd_id": "BACK"}},
+    Buttons.HOME: {"short_press": {"cmd_id": "HOME"}},
+    Buttons.CHANNEL_DOWN: {"short_press": {"cmd_id": "CHANNELDOWN"}},
+    Buttons.CHANNEL_UP: {"short_press": {"cmd_id": "CHANNELUP"}},
+    Buttons.DPAD_UP: {"short_press": {"cmd_id": "UP"}},
+    Buttons.DPAD_DOWN: {"short_press": {"cmd_id": "DOWN"}},
+    Buttons.DPAD_LEFT: {"short_press": {"cmd_id": "LEFT"}},
+    Buttons.DPAD_RIGHT: {"short_press": {"cmd_id": "RIGHT"}},
+    Buttons.DPAD_MIDDLE: {"short_press": {"cmd_id": "ENTER"}},
+    Buttons.PLAY: {"short_press": {"cmd_id": "PAUSE"}},
+    Buttons.PREV: {"short_press": {"cmd_id": "REWIND"}},
+    Buttons.NEXT: {"short_press": {"cmd_id": "FASTFORWARD"}},
+    Buttons.VOLUME_UP: {"short_press": {"cmd_id": "VOLUMEUP"}},
+    Buttons.VOLUME_DOWN: {"short_press": {"cmd_id": "VOLUMEDOWN"}},
+    Buttons.MUTE: {"short_press": {"cmd_id": "MUTE"}},
+}
 
 LG_REMOTE_BUTTONS_MAPPING: [DeviceButtonMapping] = [
-    {"button": Buttons.BACK, "short_press": {"cmd_id": "BACK"}},
-    {"button": Buttons.HOME, "short_press": {"cmd_id": "HOME"}},
-    {"button": Buttons.CHANNEL_DOWN, "short_press": {"cmd_id": "CHANNELDOWN"}},
-    {"button": Buttons.CHANNEL_UP, "short_press": {"cmd_id": "CHANNELUP"}},
-    {"button": Buttons.DPAD_UP, "short_press": {"cmd_id": "UP"}},
-    {"button": Buttons.DPAD_DOWN, "short_press": {"cmd_id": "DOWN"}},
-    {"button": Buttons.DPAD_LEFT, "short_press": {"cmd_id": "LEFT"}},
-    {"button": Buttons.DPAD_RIGHT, "short_press": {"cmd_id": "RIGHT"}},
-    {"button": Buttons.DPAD_MIDDLE, "short_press": {"cmd_id": "ENTER"}},
-    {"button": Buttons.PLAY, "short_press": {"cmd_id": "PAUSE"}},
-    {"button": Buttons.PREV, "short_press": {"cmd_id": "REWIND"}},
-    {"button": Buttons.NEXT, "short_press": {"cmd_id": "FASTFORWARD"}},
-    {"button": Buttons.VOLUME_UP, "short_press": {"cmd_id": "VOLUMEUP"}},
-    {"button": Buttons.VOLUME_DOWN, "short_press": {"cmd_id": "VOLUMEDOWN"}},
-    {"button": Buttons.MUTE, "short_press": {"cmd_id": "MUTE"}},
+    {"button": button, **mapping} for button, mapping in LG_REMOTE_BUTTONS_BY_BUTTON.items()
 ]
 
+# Shared values of remote UI page items (never mutated)
+_SIZE_1X1 = {"height": 1, "width": 1}
+_REMOTE_SEND = intern("remote.send")
+
+
+def _ui_item(command: str, *, x: int, y: int, width: int = 1, height: int = 1) -> dict:
+    """Return the common part of a remote UI page item."""
+    return {
+        "command": {
+            "cmd_id": _REMOTE_SEND,
+            "params": {"command": intern(command), "repeat": 1}
+        },
+        "location": {"x": x, "y": y},
+        "size": _SIZE_1X1 if (width, height) == (1, 1) else {"height": height, "width": width},
+    }
+
+
+def _icon(command: str, icon: str, *, x: int, y: int, width: int = 1, height: int = 1) -> dict:
+    """Return a remote UI page item displayed as an icon."""
+    return {**_ui_item(command, x=x, y=y, width=width, height=height), "icon": icon, "type": "icon"}
+
+
+def _text(command: str, text: str, *, x: int, y: int, width: int = 1, height: int = 1) -> dict:
+    """Return a remote UI page item displayed as a text."""
+    return {**_ui_item(command, x=x, y=y, width=width, height=height), "text": text, "type": "text"}
+
+
 LG_REMOTE_UI_PAGES: [UiPage] = [
     {
         "page_id": "LG commands",
         "name": "LG commands",
         "grid": {"width": 4, "height": 6},
         "items": [
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "toggle", "repeat": 1}
-                },
-                "icon": "uc:power-on",
-                "location": {
-                    "x": 0,
-                    "y": 0
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "INFO", "repeat": 1}
-                },
-                "icon": "uc:info",
-                "location": {
-                    "x": 1,
-                    "y": 0
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "AD", "repeat": 1}
-                },
-                "icon": "uc:language",
-                "location": {
-                    "x": 2,
-                    "y": 0
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "CC", "repeat": 1}
-                },
-                "icon": "uc:cc",
-                "location": {
-                    "x": 3,
-                    "y": 0
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "MYAPPS", "repeat": 1}
-                },
-                "icon": "uc:home",
-                "location": {
-                    "x": 0,
-                    "y": 1
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "MENU", "repeat": 1}
-                },
-                "text": "Settings",
-                "location": {
-                    "x": 1,
-                    "y": 1
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "text"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "INPUT_SOURCE", "repeat": 1}
-                },
-                "text": "Input",
-                "location": {
-                    "x": 2,
-                    "y": 1
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "text"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "3D_MODE", "repeat": 1}
-                },
-                "text": "3D",
-                "location": {
-                    "x": 3,
-                    "y": 1
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "text"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "REWIND", "repeat": 1}
-                },
-                "icon": "uc:bw",
-                "location": {
-                    "x": 0,
-                    "y": 2
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "PLAY", "repeat": 1}
-                },
-                "icon": "uc:play",
-                "location": {
-                    "x": 1,
-                    "y": 2
-                },
-                "size": {
-                    "height": 1,
-                    "width": 2
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "FASTFORWARD", "repeat": 1}
-                },
-                "icon": "uc:ff",
-                "location": {
-                    "x": 3,
-                    "y": 2
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "STOP", "repeat": 1}
-                },
-                "icon": "uc:stop",
-                "location": {
-                    "x": 0,
-                    "y": 3
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "PAUSE", "repeat": 1}
-                },
-                "icon": "uc:pause",
-                "location": {
-                    "x": 1,
-                    "y": 3
-                },
-                "size": {
-                    "height": 1,
-                    "width": 2
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "CHANNELUP", "repeat": 1}
-                },
-                "icon": "uc:up-arrow",
-                "location": {
-                    "x": 3,
-                    "y": 3
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "CHANNELDOWN", "repeat": 1}
-                },
-                "icon": "uc:down-arrow",
-                "location": {
-                    "x": 3,
-                    "y": 4
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "MUTE", "repeat": 1}
-                },
-                "icon": "uc:mute",
-                "location": {
-                    "x": 0,
-                    "y": 5
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "VOLUMEDOWN", "repeat": 1}
-                },
-                "icon": "uc:minus",
-                "location": {
-                    "x": 1,
-                    "y": 5
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
-            {
-                "command": {
-                    "cmd_id": "remote.send",
-                    "params": {"command": "VOLUMEUP", "repeat": 1}
-                },
-                "icon": "uc:plus",
-                "location": {
-                    "x": 2,
-                    "y": 5
-                },
-                "size": {
-                    "height": 1,
-                    "width": 1
-                },
-                "type": "icon"
-            },
+            _icon("toggle", "uc:power-on", x=0, y=0),
+            _icon("INFO", "uc:info", x=1, y=0),
+            _icon("AD", "uc:language", x=2, y=0),
+            _icon("CC", "uc:cc", x=3, y=0),
+            _icon("MYAPPS", "uc:home", x=0, y=1),
+            _text("MENU", "Settings", x=1, y=1),
+            _text("INPUT_SOURCE", "Input", x=2, y=1),
+            _text("3D_MODE", "3D", x=3, y=1),
+            _icon("REWIND", "uc:bw", x=0, y=2),
+            _icon("PLAY", "uc:play", x=1, y=2, width=2),
+            _icon("FASTFORWARD", "uc:ff", x=3, y=2),
+            _icon("STOP", "uc:stop", x=0, y=3),
+            _icon("PAUSE", "uc:pause", x=1, y=3, width=2),
+            _icon("CHANNELUP", "uc:up-arrow", x=3, y=3),
+            _icon("CHANNELDOWN", "uc:down-arrow", x=3, y=4),
+            _icon("MUTE", "uc:mute", x=0, y=5),
+            _icon("VOLUMEDOWN", "uc:minus", x=1, y=5),
+            _icon("VOLUMEUP", "uc:plus", x=2, y=5),
         ]
     },
     {
         "page_id": "LG numbers",
         "name": "LG numbers",
         "grid": {"height": 4, "width": 3},
-        "items": [{
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "1", "repeat": 1}
-            },
-            "location": {
-                "x": 0,
-                "y": 0
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "1",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "2", "repeat": 1}
-            },
-            "location": {
-                "x": 1,
-                "y": 0
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "2",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "3", "repeat": 1}
-            },
-            "location": {
-                "x": 2,
-                "y": 0
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "3",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "4", "repeat": 1}
-            },
-            "location": {
-                "x": 0,
-                "y": 1
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "4",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "5", "repeat": 1}
-            },
-            "location": {
-                "x": 1,
-                "y": 1
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "5",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "6", "repeat": 1}
-            },
-            "location": {
-                "x": 2,
-                "y": 1
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "6",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "7", "repeat": 1}
-            },
-            "location": {
-                "x": 0,
-                "y": 2
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "7",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "8", "repeat": 1}
-            },
-            "location": {
-                "x": 1,
-                "y": 2
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "8",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "9", "repeat": 1}
-            },
-            "location": {
-                "x": 2,
-                "y": 2
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "9",
-            "type": "text"
-        }, {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "0", "repeat": 1}
-            },
-            "location": {
-                "x": 1,
-                "y": 3
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "0",
-            "type": "text"
-        }
+        "items": [
+            *[_text(str(digit), str(digit), x=(digit - 1) % 3, y=(digit - 1) // 3) for digit in range(1, 10)],
+            _text("0", "0", x=1, y=3),
         ]
     },
     {
         "page_id": "LG direction pad",
         "name": "LG direction pad",
         "grid": {"height": 3, "width": 3},
-        "items": [{
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "BACK", "repeat": 1}
-            },
-            "location": {
-                "x": 0,
-                "y": 0
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "icon": "uc:back",
-            "type": "icon"
-        },{
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "UP", "repeat": 1}
-            },
-            "location": {
-                "x": 1,
-                "y": 0
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "icon": "uc:up-arrow",
-            "type": "icon"
-        },
-        {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "HOME", "repeat": 1}
-            },
-            "location": {
-                "x": 2,
-                "y": 0
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "icon": "uc:home",
-            "type": "icon"
-        },
-        {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "LEFT", "repeat": 1}
-            },
-            "location": {
-                "x": 0,
-                "y": 1
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "icon": "uc:left-arrow",
-            "type": "icon"
-        },
-        {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "ENTER", "repeat": 1}
-            },
-            "location": {
-                "x": 1,
-                "y": 1
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "OK",
-            "type": "text"
-        },
-        {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "RIGHT", "repeat": 1}
-            },
-            "location": {
-                "x": 2,
-                "y": 1
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "icon": "uc:right-arrow",
-            "type": "icon"
-        },
-        {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "DOWN", "repeat": 1}
-            },
-            "location": {
-                "x": 1,
-                "y": 2
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "icon": "uc:down-arrow",
-            "type": "icon"
-        },
-        {
-            "command": {
-                "cmd_id": "remote.send",
-                "params": {"command": "EXIT", "repeat": 1}
-            },
-            "location": {
-                "x": 2,
-                "y": 2
-            },
-            "size": {
-                "height": 1,
-                "width": 1
-            },
-            "text": "Exit",
-            "type": "text"
-        },
+        "items": [
+            _icon("BACK", "uc:back", x=0, y=0),
+            _icon("UP", "uc:up-arrow", x=1, y=0),
+            _icon("HOME", "uc:home", x=2, y=0),
+            _icon("LEFT", "uc:left-arrow", x=0, y=1),
+            _text("ENTER", "OK", x=1, y=1),
+            _icon("RIGHT", "uc:right-arrow", x=2, y=1),
+            _icon("DOWN", "uc:down-arrow", x=1, y=2),
+            _text("EXIT", "Exit", x=2, y=2),
         ]
     }
-]
\ No newline at end of file
+]
@@ -7,33 +7,76 @@ This module implements a Remote Two integration driver for LG TV receivers.
 """
 
 import asyncio
-import json
 import logging
 import os
+from functools import lru_cache
 from typing import Any
 
 import config
 import lg
 import media_player
+import orjson
 import remote
 import setup_flow
 import ucapi
 import ucapi.api_definitions as uc
 import websockets
 from config import device_from_entity_id
-from const import WEBOSTV_EXCEPTIONS
+from const import WEBOSTV_ERRORS, WEBOSTV_EXCEPTIONS
 from ucapi import IntegrationAPI
 from ucapi.api import filter_log_msg_data
-from ucapi.media_player import Attributes as MediaAttr, States
+from ucapi.media_player import Attributes as MediaAttr
+from ucapi.media_player import States
+
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    # uvloop is not available on Windows, fall back to the default asyncio loop
+    pass
 
 _LOG = logging.getLogger("driver")  # avoid having __main__ in log messages
-_LOOP = asyncio.get_event_loop()
+# Explicit loop (uvloop when installed): the integration API below is created at import time and needs it
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
 
 # Global variables
 api = ucapi.IntegrationAPI(_LOOP)
 # Map of id -> LG instance
 _configured_devices: dict[str, lg.LGDevice] = {}
+# Map of entity id -> device id of registered entities
+_entity_to_device: dict[str, str] = {}
 _R2_IN_STANDBY = False
+# Media player and remote state attributes and values checked on each device connection event
+_STATE_KEY = ucapi.media_player.Attributes.STATE
+_UNAVAILABLE = ucapi.media_player.States.UNAVAILABLE
+_STANDBY = ucapi.media_player.States.STANDBY
+_REMOTE_STATE_KEY = ucapi.remote.Attributes.STATE
+_REMOTE_UNAVAILABLE = ucapi.remote.States.UNAVAILABLE
+_REMOTE_OFF = ucapi.remote.States.OFF
+# Prebuilt state updates shared by the connection event handlers (never mutated)
+_ATTRS_STANDBY = {_STATE_KEY: _STANDBY}
+_ATTRS_UNAVAILABLE = {_STATE_KEY: _UNAVAILABLE}
+_REMOTE_ATTRS_OFF = {_REMOTE_STATE_KEY: _REMOTE_OFF}
+_REMOTE_ATTRS_UNAVAILABLE = {_REMOTE_STATE_KEY: _REMOTE_UNAVAILABLE}
+# Map of id -> last attributes forwarded to the entities of the device
+_last_sent_updates: dict[str, dict[str, Any]] = {}
+# Map of id -> last connection state of the device, aggregated into the integration device state
+_device_states: dict[str, ucapi.DeviceStates] = {}
+_DEVICE_STATE_FLUSH: asyncio.TimerHandle | None = None
+# Delay (seconds) to report a single integration device state when several devices change together
+DEVICE_STATE_DEBOUNCE = 0.05
+# References to background tasks, to avoid them being garbage collected before completion
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _create_task(coro) -> asyncio.Task:
+    """Run the given coroutine as a background task and keep a reference to it until done."""
+    task = _LOOP.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
 
 
 @api.listens_to(ucapi.Events.CONNECT)
@@ -41,12 +84,12 @@ async def on_r2_connect_cmd() -> None:
     """Connect all configured TVs when the Remote Two sends the connect command."""
     # TODO check if we were in standby and ignore the call? We'll also get an EXIT_STANDBY
     _LOG.debug("R2 connect command: connecting device(s)")
-    for device in _configured_devices.values():
+    for device in tuple(_configured_devices.values()):
         # start background task
         # TODO ? what is the connect event for (against exit from standby)
         # await _LOOP.create_task(device.power_on())
         try:
-            _LOOP.create_task(device.connect())
+            _create_task(device.connect())
         except WEBOSTV_EXCEPTIONS as ex:
             _LOG.debug(
                 "Could not connect to device, probably because it is starting with magic packet %s",
@@ -60,9 +103,7 @@ async def on_r2_disconnect_cmd():
     """Disconnect all configured TVs when the Remote Two sends the disconnect command."""
     # pylint: disable = W0212
     if len(api._clients) == 0:
-        for device in _configured_devices.values():
-            # start background task
-            await _LOOP.create_task(device.disconnect())
+        await _disconnect_devices()
 
 
 @api.listens_to(ucapi.Events.ENTER_STANDBY)
@@ -76,8 +117,16 @@ async def on_r2_enter_standby() -> None:
 
     _R2_IN_STANDBY = True
     _LOG.debug("Enter standby event: disconnecting device(s)")
-    for configured in _configured_devices.values():
-        await configured.disconnect()
+    await _disconnect_devices()
+
+
+async def _disconnect_devices() -> None:
+    """Disconnect all configured devices concurrently, a failing device doesn't prevent the others to disconnect."""
+    devices = tuple(_configured_devices.values())
+    results = await asyncio.gather(*(device.disconnect() for device in devices), return_exceptions=True)
+    for device, result in zip(devices, results):
+        if isinstance(result, Exception):
+            _LOG.error("Error while disconnecting from the LG TV %s: %s", device.id, result)
 
 
 @api.listens_to(ucapi.Events.EXIT_STANDBY)
@@ -92,13 +141,22 @@ async def on_r2_exit_standby() -> None:
     _R2_IN_STANDBY = False
     _LOG.debug("Exit standby event: connecting device(s)")
 
-    for configured in _configured_devices.values():
-        # start background task
-        try:
-            await _LOOP.create_task(configured.connect())
-        except WEBOSTV_EXCEPTIONS as ex:
-            _LOG.error("Error while reconnecting to the LG TV %s", ex)
-        # _LOOP.create_task(configured.connect())
+    async with asyncio.TaskGroup() as task_group:
+        for configured in tuple(_configured_devices.values()):
+            task_group.create_task(_reconnect_device(configured))
+
+
+async def _reconnect_device(device: lg.LGDevice) -> None:
+    """Connect the given device, errors are logged so that other devices of the same task group go on."""
+    try:
+        await device.connect()
+    except WEBOSTV_ERRORS as ex:
+        _LOG.error("Error while reconnecting to the LG TV %s: %s", device.id, ex)
+
+
+def _device_id_from_entity_id(entity_id: str) -> str | None:
+    """Return the device identifier of the given entity, from the registered entities index first."""
+    return _entity_to_device.get(entity_id) or device_from_entity_id(entity_id)
 
 
 @api.listens_to(ucapi.Events.SUBSCRIBE_ENTITIES)
@@ -115,17 +173,18 @@ async def on_subscribe_entities(entity_ids: list[str]) -> None:
 
     for entity_id in entity_ids:
         entity = api.configured_entities.get(entity_id)
-        device_id = device_from_entity_id(entity_id)
-        if device_id in _configured_devices:
-            device_config = _configured_devices[device_id]
-            attributes = device_config.attributes
+        device_id = _device_id_from_entity_id(entity_id)
+        _last_sent_updates.pop(device_id, None)
+        device = _configured_devices.get(device_id)
+        if device is not None:
+            attributes = device.attributes
             if isinstance(entity, media_player.LGTVMediaPlayer):
                 api.configured_entities.update_attributes(
                     entity_id, attributes
                 )
             if isinstance(entity, remote.LGRemote):
                 api.configured_entities.update_attributes(
-                    entity_id, {ucapi.remote.Attributes.STATE:
+                    entity_id, {_REMOTE_STATE_KEY:
                                     remote.LG_REMOTE_STATE_MAPPING.get(attributes.get(MediaAttr.STATE, States.UNKNOWN))}
                 )
             continue
@@ -143,7 +202,7 @@ async def on_unsubscribe_entities(entity_ids: list[str]) -> None:
     _LOG.debug("Unsubscribe entities event: %s", entity_ids)
     devices_to_remove = set()
     for entity_id in entity_ids:
-        device_id = device_from_entity_id(entity_id)
+        device_id = _device_id_from_entity_id(entity_id)
         if device_id is None:
             continue
         devices_to_remove.add(device_id)
@@ -153,28 +212,55 @@ async def on_unsubscribe_entities(entity_ids: list[str]) -> None:
         entity_id = entity.get("entity_id")
         if entity_id in entity_ids:
             continue
-        device_id = device_from_entity_id(entity_id)
+        device_id = _device_id_from_entity_id(entity_id)
         if device_id is None:
             continue
         if device_id in devices_to_remove:
             devices_to_remove.remove(device_id)
 
     for device_id in devices_to_remove:
-        if device_id in _configured_devices:
-            await _configured_devices[device_id].disconnect()
-            _configured_devices[device_id].events.remove_all_listeners()
+        device = _configured_devices.get(device_id)
+        if device is not None:
+            await device.disconnect()
+            device.events.remove_all_listeners()
+
+
+def _set_device_state(device_id: str, state: ucapi.DeviceStates) -> None:
+    """Record the connection state of the device and schedule the report of the integration device state."""
+    global _DEVICE_STATE_FLUSH
+
+    if device_id not in _configured_devices:
+        # event of a removed device, received after its removal
+        return
+    _device_states[device_id] = state
+    if _DEVICE_STATE_FLUSH is None:
+        _DEVICE_STATE_FLUSH = _LOOP.call_later(DEVICE_STATE_DEBOUNCE, _flush_device_state)
+
+
+def _flush_device_state() -> None:
+    """Report the integration device state: connected if any device is, otherwise error if any device failed."""
+    global _DEVICE_STATE_FLUSH
+
+    _DEVICE_STATE_FLUSH = None
+    states = set(_device_states.values())
+    if ucapi.DeviceStates.CONNECTED in states:
+        state = ucapi.DeviceStates.CONNECTED
+    elif ucapi.DeviceStates.ERROR in states:
+        state = ucapi.DeviceStates.ERROR
+    else:
+        state = ucapi.DeviceStates.DISCONNECTED
+    _create_task(api.set_device_state(state))
 
 
 async def on_device_connected(device_id: str):
     """Handle device connection."""
     _LOG.debug("LG TV connected: %s", device_id)
-    await api.set_device_state(ucapi.DeviceStates.CONNECTED)
+    _last_sent_updates.pop(device_id, None)
     if device_id not in _configured_devices:
         _LOG.warning("LG TV %s is not configured", device_id)
         return
 
-    # TODO #20 when multiple devices are supported, the device state logic isn't that simple anymore!
-    await api.set_device_state(ucapi.DeviceStates.CONNECTED)
+    _set_device_state(device_id, ucapi.DeviceStates.CONNECTED)
 
     for entity_id in _entities_from_device_id(device_id):
         configured_entity = api.configured_entities.get(entity_id)
@@ -182,24 +268,20 @@ async def on_device_connected(device_id: str):
             continue
 
         if configured_entity.entity_type == ucapi.EntityTypes.MEDIA_PLAYER:
-            if (
-                    configured_entity.attributes[ucapi.media_player.Attributes.STATE]
-                    == ucapi.media_player.States.UNAVAILABLE
-            ):
-                api.configured_entities.update_attributes(
-                    entity_id,
-                    {ucapi.media_player.Attributes.STATE: ucapi.media_player.States.STANDBY},
-                )
+            if configured_entity.attributes[_STATE_KEY] == _UNAVAILABLE:
+                api.configured_entities.update_attributes(entity_id, _ATTRS_STANDBY)
         elif configured_entity.entity_type == ucapi.EntityTypes.REMOTE:
-            if configured_entity.attributes[ucapi.remote.Attributes.STATE] == ucapi.remote.States.UNAVAILABLE:
-                api.configured_entities.update_attributes(
-                    entity_id, {ucapi.remote.Attributes.STATE: ucapi.remote.States.OFF}
-                )
+            if configured_entity.attributes[_REMOTE_STATE_KEY] == _REMOTE_UNAVAILABLE:
+                api.configured_entities.update_attributes(entity_id, _REMOTE_ATTRS_OFF)
+
+    # the device only reports changed values: send its current state after the reset above
+    await on_device_update(device_id, None)
 
 
 async def on_device_disconnected(device_id: str):
     """Handle device disconnection."""
     _LOG.debug("LG TV disconnected: %s", device_id)
+    _last_sent_updates.pop(device_id, None)
 
     for entity_id in _entities_from_device_id(device_id):
         configured_entity = api.configured_entities.get(entity_id)
@@ -207,22 +289,17 @@ async def on_device_disconnected(device_id: str):
             continue
 
         if configured_entity.entity_type == ucapi.EntityTypes.MEDIA_PLAYER:
-            api.configured_entities.update_attributes(
-                entity_id,
-                {ucapi.media_player.Attributes.STATE: ucapi.media_player.States.UNAVAILABLE},
-            )
+            api.configured_entities.update_attributes(entity_id, _ATTRS_UNAVAILABLE)
         elif configured_entity.entity_type == ucapi.EntityTypes.REMOTE:
-            api.configured_entities.update_attributes(
-                entity_id, {ucapi.remote.Attributes.STATE: ucapi.remote.States.UNAVAILABLE}
-            )
+            api.configured_entities.update_attributes(entity_id, _REMOTE_ATTRS_UNAVAILABLE)
 
-    # TODO #20 when multiple devices are supported, the device state logic isn't that simple anymore!
-    await api.set_device_state(ucapi.DeviceStates.DISCONNECTED)
+    _set_device_state(device_id, ucapi.DeviceStates.DISCONNECTED)
 
 
 async def on_device_connection_error(device_id: str, message):
     """Set entities of LG TV to state UNAVAILABLE if device connection error occurred."""
     _LOG.error(message)
+    _last_sent_updates.pop(device_id, None)
 
     for entity_id in _entities_from_device_id(device_id):
         configured_entity = api.configured_entities.get(entity_id)
@@ -230,17 +307,11 @@ async def on_device_connection_error(device_id: str, message):
             continue
 
         if configured_entity.entity_type == ucapi.EntityTypes.MEDIA_PLAYER:
-            api.configured_entities.update_attributes(
-                entity_id,
-                {ucapi.media_player.Attributes.STATE: ucapi.media_player.States.UNAVAILABLE},
-            )
+            api.configured_entities.update_attributes(entity_id, _ATTRS_UNAVAILABLE)
         elif configured_entity.entity_type == ucapi.EntityTypes.REMOTE:
-            api.configured_entities.update_attributes(
-                entity_id, {ucapi.remote.Attributes.STATE: ucapi.remote.States.UNAVAILABLE}
-            )
+            api.configured_entities.update_attributes(entity_id, _REMOTE_ATTRS_UNAVAILABLE)
 
-    # TODO #20 when multiple devices are supported, the device state logic isn't that simple anymore!
-    await api.set_device_state(ucapi.DeviceStates.ERROR)
+    _set_device_state(device_id, ucapi.DeviceStates.ERROR)
 
 
 async def handle_device_address_change(device_id: str, address: str) -> None:
@@ -258,6 +329,11 @@ async def handle_device_address_change(device_id: str, address: str) -> None:
         config.devices.update(device)
 
 
+def _changed_attributes(last_sent: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
+    """Return the attributes of the given update which differ from the last forwarded ones."""
+    return {key: value for key, value in update.items() if key not in last_sent or last_sent[key] != value}
+
+
 async def on_device_update(device_id: str, update: dict[str, Any] | None) -> None:
     """
     Update attributes of configured media-player entity if device properties changed.
@@ -266,41 +342,59 @@ async def on_device_update(device_id: str, update: dict[str, Any] | None) -> Non
     :param update: dictionary containing the updated properties or None if
     """
     if update is None:
-        if device_id not in _configured_devices:
+        device = _configured_devices.get(device_id)
+        if device is None:
+            return
+        if not any(api.configured_entities.get(entity_id) for entity_id in _entities_from_device_id(device_id)):
             return
-        device = _configured_devices[device_id]
         update = device.attributes
-    else:
+    elif _LOG.isEnabledFor(logging.INFO):
         _LOG.info("[%s] LG TV update: %s", device_id, update)
 
-    attributes = None
+    last_sent = _last_sent_updates.get(device_id, {})
+    update = _changed_attributes(last_sent, update)
+    if not update:
+        return
+    if MediaAttr.STATE in update:
+        # entities reset their media attributes on state change: forget what was sent before
+        _last_sent_updates[device_id] = dict(update)
+    else:
+        last_sent.update(update)
+        _last_sent_updates[device_id] = last_sent
 
     # TODO awkward logic: this needs better support from the integration library
-    _LOG.info("Update device %s for configured devices %s", device_id, api.configured_entities)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("Update configured entities of device %s: %s", device_id, update)
+    pending: list[tuple[str, dict[str, Any]]] = []
     for entity_id in _entities_from_device_id(device_id):
         configured_entity = api.configured_entities.get(entity_id)
-        if configured_entity is None:
-            return
-
-        if isinstance(configured_entity, media_player.LGTVMediaPlayer):
-            attributes = configured_entity.filter_changed_attributes(update)
-        elif isinstance(configured_entity, remote.LGRemote):
+        if isinstance(configured_entity, (media_player.LGTVMediaPlayer, remote.LGRemote)):
             attributes = configured_entity.filter_changed_attributes(update)
+            if attributes:
+                pending.append((entity_id, attributes))
+    _flush_updates(pending)
 
-        if attributes:
-            api.configured_entities.update_attributes(entity_id, attributes)
 
+def _flush_updates(pending: list[tuple[str, dict[str, Any]]]) -> None:
+    """Send the pending attributes updates, a single update per entity."""
+    updates: dict[str, dict[str, Any]] = {}
+    for entity_id, attributes in pending:
+        updates.setdefault(entity_id, {}).update(attributes)
+    for entity_id, attributes in updates.items():
+        api.configured_entities.update_attributes(entity_id, attributes)
 
-def _entities_from_device_id(device_id: str) -> list[str]:
+
+@lru_cache(maxsize=256)
+def _entities_from_device_id(device_id: str) -> tuple[str, ...]:
     """
     Return all associated entity identifiers of the given device.
 
     :param device_id: the device identifier
-    :return: list of entity identifiers
+    :return: tuple of entity identifiers
     """
     # dead simple for now: one media_player entity per device!
     # TODO #21 support multiple zones: one media-player per zone
-    return [f"media_player.{device_id}", f"remote.{device_id}"]
+    return f"media_player.{device_id}", f"remote.{device_id}"
 
 
 def _configure_new_device(device_config: config.LGConfigDevice, connect: bool = True) -> None:
@@ -313,27 +407,30 @@ def _configure_new_device(device_config: config.LGConfigDevice, connect: bool =
     :param connect: True: start connection to receiver.
     """
     # the device may be already configured if the user changed settings of existing device
-    if device_config.id in _configured_devices:
+    device = _configured_devices.get(device_config.id)
+    existing = device is not None
+    if existing:
         _LOG.debug("Existing config device updated, update the running device %s", device_config)
-        device = _configured_devices[device_config.id]
         device.update_config(device_config)
     else:
         device = lg.LGDevice(device_config, loop=_LOOP)
 
-        _LOOP.create_task(on_device_connected(device.id))
-        # device.events.on(lg.Events.CONNECTED, on_device_connected)
-        # device.events.on(lg.Events.DISCONNECTED, on_device_disconnected)
-        device.events.on(lg.Events.ERROR, on_device_connection_error)
-        device.events.on(lg.Events.UPDATE, on_device_update)
+        for event, handler in (
+            (lg.Events.CONNECTED, on_device_connected),
+            (lg.Events.DISCONNECTED, on_device_disconnected),
+            (lg.Events.ERROR, on_device_connection_error),
+            (lg.Events.UPDATE, on_device_update),
+        ):
+            device.events.on(event, handler)
         # TODO event change address
         # receiver.events.on(lg.Events.IP_ADDRESS_CHANGED, handle_lg_address_change)
         # receiver.connect()
         _configured_devices[device.id] = device
 
     if connect:
-        # start background connection task
+        # start background connection task, an existing device closes its current session first
         try:
-            _LOOP.create_task(device.connect())
+            _create_task(_reconnect_existing_device(device) if existing else device.connect())
         except WEBOSTV_EXCEPTIONS as ex:
             _LOG.debug(
                 "Could not connect to device, probably because it is starting with magic packet %s",
@@ -342,6 +439,12 @@ def _configure_new_device(device_config: config.LGConfigDevice, connect: bool =
     _register_available_entities(device_config, device)
 
 
+async def _reconnect_existing_device(device: lg.LGDevice) -> None:
+    """Disconnect the device from its previous session before connecting with the updated configuration."""
+    await device.disconnect()
+    await device.connect()
+
+
 def _register_available_entities(device_config: config.LGConfigDevice, device: lg.LGDevice) -> None:
     """
     Create entities for given receiver device and register them as available entities.
@@ -354,6 +457,7 @@ def _register_available_entities(device_config: config.LGConfigDevice, device: l
         if api.available_entities.contains(entity.id):
             api.available_entities.remove(entity.id)
         api.available_entities.add(entity)
+        _entity_to_device[entity.id] = device_config.id
 
 
 def on_device_added(device: config.LGConfigDevice) -> None:
@@ -366,19 +470,27 @@ def on_device_removed(device: config.LGConfigDevice | None) -> None:
     """Handle a removed device in the configuration."""
     if device is None:
         _LOG.debug("Configuration cleared, disconnecting & removing all configured LG TV instances")
-        for configured in _configured_devices.values():
-            _LOOP.create_task(_async_remove(configured))
+        for configured in tuple(_configured_devices.values()):
+            _create_task(_async_remove(configured))
         _configured_devices.clear()
+        _last_sent_updates.clear()
+        _device_states.clear()
+        _entity_to_device.clear()
+        _entities_from_device_id.cache_clear()
         api.configured_entities.clear()
         api.available_entities.clear()
     else:
-        if device.id in _configured_devices:
+        configured = _configured_devices.pop(device.id, None)
+        if configured is not None:
             _LOG.debug("Disconnecting from removed LG TV %s", device.id)
-            configured = _configured_devices.pop(device.id)
-            _LOOP.create_task(_async_remove(configured))
+            _last_sent_updates.pop(device.id, None)
+            _device_states.pop(device.id, None)
+            _create_task(_async_remove(configured))
             for entity_id in _entities_from_device_id(configured.id):
+                _entity_to_device.pop(entity_id, None)
                 api.configured_entities.remove(entity_id)
                 api.available_entities.remove(entity_id)
+            _entities_from_device_id.cache_clear()
 
 
 async def _async_remove(device: lg.LGDevice) -> None:
@@ -387,6 +499,11 @@ async def _async_remove(device: lg.LGDevice) -> None:
     device.events.remove_all_listeners()
 
 
+def _json_dumps(data: Any) -> str:
+    """Serialize the given data to a JSON string, enum keys included."""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
 async def patched_broadcast_ws_event(self, msg: str, msg_data: dict[str, Any], category: uc.EventCategory) -> None:
     """
     Send the given event-message to all connected WebSocket clients.
@@ -399,18 +516,21 @@ async def patched_broadcast_ws_event(self, msg: str, msg_data: dict[str, Any], c
     :param category: event category
     """
     data = {"kind": "event", "msg": msg, "msg_data": msg_data, "cat": category}
-    data_dump = json.dumps(data)
-    # filter fields
-    if _LOG.isEnabledFor(logging.DEBUG):
-        data_log = json.dumps(data) if filter_log_msg_data(data) else data_dump
+    data_dump = _json_dumps(data)
     # pylint: disable = W0212
-    for websocket in self._clients.copy():
-        if _LOG.isEnabledFor(logging.DEBUG):
+    clients = tuple(self._clients)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        # filter fields: filter_log_msg_data strips the images from data in place (its result is only a flag),
+        # so it must run after data_dump is built with the complete message
+        filter_log_msg_data(data)
+        data_log = _json_dumps(data)
+        for websocket in clients:
             _LOG.debug("[%s] ->: %s", websocket.remote_address, data_log)
-        try:
-            await websocket.send(data_dump)
-        except websockets.exceptions.WebSocketException:
-            pass
+    # send to all clients concurrently, a client no longer connected doesn't block the others
+    results = await asyncio.gather(*(websocket.send(data_dump) for websocket in clients), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, websockets.exceptions.WebSocketException):
+            raise result
 
 
 async def main():
@@ -418,22 +538,14 @@ async def main():
     logging.basicConfig()
 
     level = os.getenv("UC_LOG_LEVEL", "DEBUG").upper()
-    logging.getLogger("lg").setLevel(level)
-    logging.getLogger("discover").setLevel(level)
-    logging.getLogger("driver").setLevel(level)
-    logging.getLogger("media_player").setLevel(level)
-    logging.getLogger("config").setLevel(level)
-    logging.getLogger("setup_flow").setLevel(level)
+    for logger_name in ("lg", "discover", "driver", "media_player", "config", "setup_flow"):
+        logging.getLogger(logger_name).setLevel(level)
 
     config.devices = config.Devices(api.config_dir_path, on_device_added, on_device_removed)
     for device_config in config.devices.all():
         _configure_new_device(device_config, connect=False)
 
-    # _LOOP.create_task(receiver_status_poller())
-    for device in _configured_devices.values():
-        if not device.available:
-            continue
-
+    # Devices are connected on the Remote Two connect event, not at startup
     # pylint: disable = W0212
     IntegrationAPI._broadcast_ws_event = patched_broadcast_ws_event
     await api.init("driver.json", setup_flow.driver_setup_handler)
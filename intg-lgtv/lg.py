@@ -7,12 +7,14 @@ This module implements the AVR AVR receiver communication of the Remote Two inte
 
 import asyncio
 import logging
+import math
+import random
 import socket
-import struct
-import time
 from asyncio import AbstractEventLoop, Lock, shield
+from collections import deque
+from contextlib import suppress
 from enum import IntEnum
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import (
     Any,
     Awaitable,
@@ -21,7 +23,6 @@ from typing import (
     Coroutine,
     ParamSpec,
     TypeVar,
-    cast,
 )
 from xmlrpc.client import ProtocolError
 
@@ -29,7 +30,7 @@ import ucapi
 from aiohttp import ServerTimeoutError
 from aiowebostv import WebOsClient, WebOsTvCommandError, endpoints
 from config import LGConfigDevice
-from const import LG_FEATURES, LIVE_TV_APP_ID, WEBOSTV_EXCEPTIONS, LG_SOUND_OUTPUTS
+from const import LG_FEATURES, LIVE_TV_APP_ID, WEBOSTV_ERRORS, WEBOSTV_EXCEPTIONS, LG_SOUND_OUTPUTS
 from httpx import TransportError
 from pyee.asyncio import AsyncIOEventEmitter
 from ucapi.media_player import Attributes as MediaAttr, States
@@ -39,9 +40,38 @@ _LOG = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 5
 BUFFER_LIFETIME = 30
+BUFFER_MAX_COMMANDS = 32
 CONNECTION_RETRIES = 10
+# Reconnection delay (seconds): exponential from RECONNECT_BASE up to RECONNECT_MAX, plus a random jitter ratio
+RECONNECT_BASE = 1.0
+RECONNECT_MAX = 30.0
+RECONNECT_JITTER = 0.5
 
 INIT_APPS_LAUNCH_DELAY = 10
+POWER_OFF_TIMEOUT = 10
+# Minimum delay (seconds) between two requests of the sources while the TV returns none, on state change callbacks
+SOURCES_RETRY_DELAY = 30
+# Delay (seconds) to merge bursts of attribute changes (volume, title, image...) into a single update event
+UPDATE_DEBOUNCE_DELAY = 0.05
+
+# Media player attributes and states used on each TV state update
+_ATTR_MEDIA_IMAGE_URL = MediaAttr.MEDIA_IMAGE_URL
+_ATTR_MEDIA_TITLE = MediaAttr.MEDIA_TITLE
+_ATTR_MEDIA_TYPE = MediaAttr.MEDIA_TYPE
+_ATTR_MUTED = MediaAttr.MUTED
+_ATTR_SOUND_MODE = MediaAttr.SOUND_MODE
+_ATTR_SOURCE = MediaAttr.SOURCE
+_ATTR_SOURCE_LIST = MediaAttr.SOURCE_LIST
+_ATTR_STATE = MediaAttr.STATE
+_ATTR_VOLUME = MediaAttr.VOLUME
+_STATE_ON = States.ON
+_STATE_OFF = States.OFF
+# Power state values reported by the TV
+_UNKNOWN_POWER_STATES = frozenset({None, "Unknown"})
+_STANDBY_POWER_STATES = frozenset({"Power Off", "Suspend", "Active Standby"})
+_NO_APP_IDS = frozenset({None, ""})
+# Sound output identifiers by label
+_SOUND_OUTPUTS_BY_LABEL = {label: sound_output for sound_output, label in LG_SOUND_OUTPUTS.items()}
 
 class LGState(IntEnum):
     OFF = 0
@@ -65,19 +95,13 @@ _P = ParamSpec("_P")
 async def retry_call_command(timeout: float, bufferize: bool, func: Callable[Concatenate[_LGDeviceT, _P], Awaitable[ucapi.StatusCodes | None]],
                  obj: _LGDeviceT, *args: _P.args, **kwargs: _P.kwargs) -> ucapi.StatusCodes:
     """Retry call command when failed"""
-    # Launch reconnection task if not active
-    if not obj._connect_task:
-        obj._connect_task = asyncio.create_task(obj._connect_loop())
-        await asyncio.sleep(0)
+    # Launch reconnection task if not active, otherwise share the running one
+    if obj._connect_task is None or obj._connect_task.done():
+        obj._connect_task = obj.event_loop.create_task(obj._connect_loop())
     # If the command should be bufferized (and retried later) add it to the list and returns OK
     if bufferize:
         _LOG.debug("Bufferize command %s %s", func, args)
-        obj._buffered_callbacks[time.time()] = {
-            "object": obj,
-            "function": func,
-            "args": args,
-            "kwargs": kwargs
-        }
+        obj.buffer_command(func, *args, **kwargs)
         return ucapi.StatusCodes.OK
     try:
         # Else (no bufferize) wait (not more than "timeout" seconds) for the connection to complete
@@ -112,6 +136,11 @@ def retry(*, timeout:float=5, bufferize=False
                 _LOG.debug("Device is unavailable, connecting before executing command...")
                 return await retry_call_command(timeout, bufferize, func, obj, *args, **kwargs)
             except WEBOSTV_EXCEPTIONS as ex:
+                # The TV is connected and rejected the command itself: reconnecting would not help
+                if isinstance(ex, WebOsTvCommandError) and obj.available and obj._tv.connection is not None:
+                    _LOG.error("Error calling %s on [%s(%s)]: %r", func.__name__, obj._name,
+                               obj._device_config.address, ex)
+                    return ucapi.StatusCodes.BAD_REQUEST
                 if obj.state == States.OFF:
                     log_function = _LOG.debug
                 else:
@@ -144,18 +173,12 @@ def retry(*, timeout:float=5, bufferize=False
     return decorator
 
 
+@lru_cache(maxsize=32)
 def create_magic_packet(mac_address: str) -> bytes:
-    """Create a magic packet to wake on LAN."""
-    addr_byte = mac_address.split(":")
-    hw_addr = struct.pack(
-        "BBBBBB",
-        int(addr_byte[0], 16),
-        int(addr_byte[1], 16),
-        int(addr_byte[2], 16),
-        int(addr_byte[3], 16),
-        int(addr_byte[4], 16),
-        int(addr_byte[5], 16),
-    )
+    """Create a magic packet to wake on LAN, packets are cached per mac address."""
+    hw_addr = bytes.fromhex("".join(addr_byte.zfill(2) for addr_byte in mac_address.split(":")))
+    if len(hw_addr) != 6:
+        raise ValueError(f"Invalid mac address {mac_address}")
     return b"\xff" * 6 + hw_addr * 16
 
 
@@ -184,6 +207,11 @@ class LGDevice:
         self._attr_is_volume_muted = False
         self._active_source = None
         self._sources = {}
+        self._sorted_sources: list[str] = []
+        self._sources_key: tuple | None = None
+        # ordered input ids and their positions, to select the next input
+        self._input_ids: tuple[str, ...] = ()
+        self._input_positions: dict[str, int] = {}
         self._unique_id: str | None = None
         self._supported_features = LG_FEATURES
         self._paused = False
@@ -192,16 +220,34 @@ class LGDevice:
         self._media_image_url = ""
         self._attr_state = States.OFF
         self._connect_task = None
-        self._buffered_callbacks = {}
+        self._buffered_callbacks: deque[tuple[float, Callable, tuple, dict]] = deque(maxlen=BUFFER_MAX_COMMANDS)
         self._connect_lock = Lock()
         self._reconnect_retry = 0
         self._sound_output = None
+        self._sound_output_label: str | None = None
         self._retry_wakeonlan = False
+        self._pending_update: dict[str, Any] = {}
+        self._update_handle: asyncio.TimerHandle | None = None
+        self._wol_destination = self._get_wol_destination()
+        self._sources_fetch_time = -math.inf
+        # References to fire-and-forget tasks, to avoid them being garbage collected before completion
+        self._background_tasks: set[asyncio.Task] = set()
 
         _LOG.debug("LG TV created: %s", device_config.address)
 
     def update_config(self, device_config: LGConfigDevice):
         self._device_config = device_config
+        self._wol_destination = self._get_wol_destination()
+
+    def _get_wol_destination(self) -> tuple[str, int]:
+        """Return the (broadcast address, port) of the wake-on-lan packets from the configuration."""
+        broadcast = "<broadcast>"
+        if self._device_config.broadcast is not None and self._device_config.broadcast != "255.255.255.255":
+            broadcast = self._device_config.broadcast
+        wol_port = self._device_config.wol_port
+        if wol_port is None:
+            wol_port = 9
+        return broadcast, wol_port
 
     async def register_websocket_events(self):
         """Activate websocket for listening if wanted. the websocket has to be recreated when the device goes off."""
@@ -231,8 +277,8 @@ class LGDevice:
         async def _on_sound_output_changed(sound_output: str):
             if sound_output:
                 if self._sound_output != sound_output:
-                    self._sound_output = sound_output
-                    self.events.emit(Events.UPDATE, self.id, {MediaAttr.SOUND_MODE: self.sound_output})
+                    self._set_sound_output(sound_output)
+                    self._emit_update({MediaAttr.SOUND_MODE: self.sound_output})
 
 
         await self._tv.register_state_update_callback(_on_state_changed)
@@ -241,165 +287,183 @@ class LGDevice:
     def _update_sources(self, updated_data: any) -> None:
         """Update list of sources from current source, apps, inputs and configured list."""
         current_source_list = self._sources
-        self._sources = {}
+        current_app_id = self._tv.current_app_id
+        apps = self._tv.apps
+        inputs = self._tv.inputs
+        # most state changes (volume, channel...) leave the apps, inputs and current app untouched: compare them
+        # with copies of the previous dicts, cheap as unchanged entries are the same objects (titles included)
+        if (current_app_id, apps, inputs) == self._sources_key:
+            return
+        self._sources_key = (current_app_id, dict(apps), dict(inputs))
+        sources = {}
         active_source = None
         found_live_tv = False
-        for app in self._tv.apps.values():
-            if app["id"] == LIVE_TV_APP_ID:
+        for app in apps.values():
+            app_id = app["id"]
+            if app_id == LIVE_TV_APP_ID:
                 found_live_tv = True
-            if app["id"] == self._tv.current_app_id:
+            if app_id == current_app_id:
                 active_source = app["title"]
-                self._sources[app["title"]] = app
-            else:
-                self._sources[app["title"]] = app
+            sources[app["title"]] = app
 
-        for source in self._tv.inputs.values():
-            if source["appId"] == LIVE_TV_APP_ID:
+        input_ids = []
+        for source in inputs.values():
+            app_id = source["appId"]
+            if app_id == LIVE_TV_APP_ID:
                 found_live_tv = True
-            if source["appId"] == self._tv.current_app_id:
+            if app_id == current_app_id:
                 active_source = source["id"]
-                self._sources[source["id"]] = source
-            else:
-                self._sources[source["id"]] = source
+            sources[source["id"]] = source
+            input_ids.append(source["id"])
+        self._input_ids = tuple(input_ids)
+        self._input_positions = {input_id: index for index, input_id in enumerate(input_ids)}
 
         # empty list, TV may be off, keep previous list
-        if not self._sources and current_source_list:
-            self._sources = current_source_list
+        if not sources and current_source_list:
+            sources = current_source_list
         # special handling of live tv since this might
         # not appear in the app or input lists in some cases
         elif not found_live_tv:
-            app = {"id": LIVE_TV_APP_ID, "title": "Live TV"}
-            if self._tv.current_app_id == LIVE_TV_APP_ID:
-                active_source = app["title"]
-                self._sources["Live TV"] = app
-            else:
-                self._sources["Live TV"] = app
+            if current_app_id == LIVE_TV_APP_ID:
+                active_source = "Live TV"
+            sources["Live TV"] = {"id": LIVE_TV_APP_ID, "title": "Live TV"}
 
-        if (
-                not current_source_list and self._sources
-        ):  # or (self._sources and list(self._sources.keys()).sort() != list(current_source_list).sort()):
-            _LOG.debug("Source list %s", self._sources)
-            updated_data[MediaAttr.SOURCE_LIST] = sorted(self._sources)
+        self._sources = sources
+        # sort and report the source names only when they changed
+        if sources.keys() != current_source_list.keys():
+            _LOG.debug("Source list %s", sources)
+            self._sorted_sources = sorted(sources)
+            updated_data[_ATTR_SOURCE_LIST] = self._sorted_sources
 
         if active_source != self._active_source:
             _LOG.debug("Active source %s", active_source)
             self._active_source = active_source
-            updated_data[MediaAttr.SOURCE] = self._active_source
+            updated_data[_ATTR_SOURCE] = self._active_source
 
     async def _update_states(self, data: WebOsClient | None) -> None:
         """Update entity state attributes."""
-        # pylint: disable = R0915
+        # pylint: disable = R0914, R0915
         updated_data = {}
-        if not self._sources:
-            try:
-                sources = await self._tv.get_inputs()
-                _LOG.info("Empty sources, retrieve them %s", sources)
-                await self._tv.set_inputs_state(sources)
-                await self._tv.set_apps_state(await self._tv.get_apps())
-                await self._tv.set_current_app_state(await self._tv.get_current_app())
-            # pylint: disable = W0718
-            except Exception:
-                pass
+        # on state change callbacks, do not request again the sources of a TV which failed to send them recently
+        now = self.event_loop.time()
+        if not self._sources and (data is None or now - self._sources_fetch_time > SOURCES_RETRY_DELAY):
+            self._sources_fetch_time = now
+            # independent requests: send them together, a failed one does not prevent the others
+            sources, apps, current_app = await asyncio.gather(
+                self._tv.get_inputs(), self._tv.get_apps(), self._tv.get_current_app(), return_exceptions=True
+            )
+            _LOG.info("Empty sources, retrieve them %s", sources)
+            with suppress(*WEBOSTV_ERRORS):
+                if not isinstance(sources, BaseException):
+                    await self._tv.set_inputs_state(sources)
+                if not isinstance(apps, BaseException):
+                    await self._tv.set_apps_state(apps)
+                if not isinstance(current_app, BaseException):
+                    await self._tv.set_current_app_state(current_app)
 
         self._update_sources(updated_data)
 
         # Bug on LG library where power_state not updated, force it
-        try:
+        is_on = False
+        with suppress(*WEBOSTV_ERRORS):
             # pylint: disable = W0212
             self._tv._power_state = await self._tv.get_power_state()
             is_on = self._tv.is_on
-        # pylint: disable = W0718
-        except Exception:
-            is_on = False
 
         if data and data.sound_output:
             if self._sound_output != data.sound_output:
-                self._sound_output = data.sound_output
-                updated_data[MediaAttr.SOUND_MODE] = self.sound_output
+                self._set_sound_output(data.sound_output)
+                updated_data[_ATTR_SOUND_MODE] = self.sound_output
         elif self._sound_output is None:
             try:
-                self._sound_output = await self._tv.get_sound_output()
+                self._set_sound_output(await self._tv.get_sound_output())
                 if self._sound_output:
-                    updated_data[MediaAttr.SOUND_MODE] = self.sound_output
+                    updated_data[_ATTR_SOUND_MODE] = self.sound_output
                 _LOG.debug("Sound output %s", self._sound_output)
-            except Exception as ex:
-                _LOG.warning("Error extraction of sound output", ex)
-                pass
-
-        state = States.ON if is_on else States.OFF
-        if state != self.state:
-            self._attr_state = state
-            updated_data[MediaAttr.STATE] = self.state
+            except WEBOSTV_ERRORS as ex:
+                _LOG.warning("Error extraction of sound output %s", ex)
 
-        muted = cast(bool, self._tv.muted)
-        if muted != self._attr_is_volume_muted:
-            self._attr_is_volume_muted = muted
-            updated_data[MediaAttr.MUTED] = self._attr_is_volume_muted
-
-        if self._tv.volume is not None:
-            volume = cast(float, self._tv.volume)
-            if volume != self._volume:
-                self._volume = volume
-                updated_data[MediaAttr.VOLUME] = self._volume
-
-        media_type = MediaType.VIDEO
-        if self._tv.current_app_id == LIVE_TV_APP_ID:
-            media_type = MediaType.TVSHOW
-
-        if media_type != self._media_type:
-            self._media_type = media_type
-            updated_data[MediaAttr.MEDIA_TYPE] = self._media_type
+        tv = self._tv
+        current_app_id = tv.current_app_id
+        live_tv = current_app_id == LIVE_TV_APP_ID
 
         media_title = ""
-        if self._tv.current_app_id == LIVE_TV_APP_ID and self._tv.current_channel is not None:
-            media_title = cast(str, self._tv.current_channel.get("channelName"))
-
-        if media_title != self._media_title:
-            self._media_title = media_title
-            updated_data[MediaAttr.MEDIA_TITLE] = self._media_title
+        if live_tv and (current_channel := tv.current_channel) is not None:
+            media_title = current_channel.get("channelName")
 
         # TODO playing / paused state to update
         media_image_url = ""
-        if self._tv.current_app_id in self._tv.apps:
-            icon: str = self._tv.apps[self._tv.current_app_id]["largeIcon"]
-            if not icon.startswith("http"):
-                icon = self._tv.apps[self._tv.current_app_id]["icon"]
-            media_image_url = icon
-        if media_image_url != self._media_image_url:
-            self._media_image_url = media_image_url
-            updated_data[MediaAttr.MEDIA_IMAGE_URL] = self._media_image_url
-
-        _sound_output = self._sound_output
-        self._sound_output = self._tv.sound_output
-        if _sound_output != self._sound_output:
-            updated_data[MediaAttr.SOUND_MODE] = self.sound_output
+        if (app := tv.apps.get(current_app_id)) is not None:
+            media_image_url = app["largeIcon"]
+            if not media_image_url.startswith("http"):
+                media_image_url = app["icon"]
+
+        # (instance attribute, new value, media player attribute, keep the cached value when None):
+        # only changed values are updated and reported
+        for name, value, attribute, skip_none in (
+            ("_attr_state", _STATE_ON if is_on else _STATE_OFF, _ATTR_STATE, False),
+            ("_attr_is_volume_muted", tv.muted, _ATTR_MUTED, False),
+            ("_volume", tv.volume, _ATTR_VOLUME, True),
+            ("_media_type", MediaType.TVSHOW if live_tv else MediaType.VIDEO, _ATTR_MEDIA_TYPE, False),
+            ("_media_title", media_title, _ATTR_MEDIA_TITLE, False),
+            ("_media_image_url", media_image_url, _ATTR_MEDIA_IMAGE_URL, False),
+        ):
+            if value != getattr(self, name) and not (skip_none and value is None):
+                setattr(self, name, value)
+                updated_data[attribute] = value
 
+        if updated_data:
+            self._emit_update(updated_data)
+
+    def _create_task(self, coro) -> asyncio.Task:
+        """Run the given coroutine as a background task and keep a reference to it until done."""
+        task = self.event_loop.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def _set_sound_output(self, sound_output: str | None) -> None:
+        """Set the current sound output and its label (mapped once per change rather than on each read)."""
+        self._sound_output = sound_output
+        if sound_output is None:
+            self._sound_output_label = None
+            return
+        self._sound_output_label = LG_SOUND_OUTPUTS.get(sound_output, None)
+        if self._sound_output_label is None:
+            _LOG.error("Unknown sound output %s, report to developer", sound_output)
+
+    def _emit_update(self, updated_data: dict[str, Any]) -> None:
+        """Merge the given attributes into the pending update event, emitted after the debounce delay."""
+        self._pending_update.update(updated_data)
+        if self._update_handle is None:
+            self._update_handle = self.event_loop.call_later(UPDATE_DEBOUNCE_DELAY, self._flush_update)
+
+    def _flush_update(self) -> None:
+        """Emit the merged update event."""
+        self._update_handle = None
+        updated_data, self._pending_update = self._pending_update, {}
         if updated_data:
             self.events.emit(Events.UPDATE, self.id, updated_data)
 
+    def buffer_command(self, function: Callable[..., Awaitable[Any]], *args, **kwargs) -> None:
+        """Buffer the given LGDevice method call to execute it once connected (monotonic timestamp)."""
+        self._buffered_callbacks.append((self.event_loop.time(), function, args, kwargs))
+
     async def _run_buffered_commands(self):
-        # Handle awaiting commands to process
+        # Handle awaiting commands to process, in their original order (e.g. successive remote buttons)
         if self._buffered_callbacks:
             _LOG.debug("Connected, executing buffered commands")
-            while self._buffered_callbacks:
-                items = dict(sorted(self._buffered_callbacks.items()))
-                try:
-                    for timestamp, value in items.items():
-                        del self._buffered_callbacks[timestamp]
-                        if time.time() - timestamp <= BUFFER_LIFETIME:
-                            _LOG.debug("Calling buffered command %s", value)
-                            try:
-                                if "kwargs" in value:
-                                    await value["function"](value["object"], *value["args"], **value["kwargs"])
-                                else:
-                                    await value["function"](value["object"],*value["args"])
-                            # pylint: disable = W0718
-                            except Exception as ex:
-                                _LOG.warning("Error while calling buffered command %s", ex)
-                        else:
-                            _LOG.debug("Buffered command too old %s, dropping it", value)
-                except RuntimeError:
-                    pass
+        while self._buffered_callbacks:
+            timestamp, function, args, kwargs = self._buffered_callbacks.popleft()
+            if self.event_loop.time() - timestamp > BUFFER_LIFETIME:
+                _LOG.debug("Buffered command too old %s, dropping it", function.__name__)
+                continue
+            _LOG.debug("Calling buffered command %s %s", function.__name__, args)
+            try:
+                await function(self, *args, **kwargs)
+            # pylint: disable = W0718
+            except Exception as ex:
+                _LOG.warning("Error while calling buffered command %s", ex)
 
     async def _connect_loop(self) -> None:
         """Connect loop.
@@ -408,7 +472,8 @@ class LGDevice:
         device has shutdown by itself.
         """
         while True:
-            await asyncio.sleep(DEFAULT_TIMEOUT)
+            delay = min(RECONNECT_MAX, RECONNECT_BASE * (2 ** self._reconnect_retry))
+            await asyncio.sleep(delay * (1 + random.uniform(0, RECONNECT_JITTER)))
             try:
                 await self.connect()
                 if self._tv.is_on:
@@ -417,8 +482,19 @@ class LGDevice:
                     self._reconnect_retry = 0
                     self._retry_wakeonlan = False
                     break
-            except WEBOSTV_EXCEPTIONS:
+            except WEBOSTV_ERRORS:
                 pass
+            # pylint: disable = W0718
+            except Exception as ex:
+                # not a connection error: retrying would fail the same way, the error is logged by the listener
+                self.events.emit(
+                    Events.ERROR,
+                    self.id,
+                    f"LG {self._device_config.address} unexpected error while connecting, abort retries: {ex}",
+                )
+                self._connect_task = None
+                self._reconnect_retry = 0
+                break
             self._reconnect_retry += 1
             if self._reconnect_retry > CONNECTION_RETRIES:
                 _LOG.debug("LG %s not connected abort retries", self._device_config.address)
@@ -426,7 +502,7 @@ class LGDevice:
                 self._reconnect_retry = 0
                 break
             if self._retry_wakeonlan:
-                self.wakeonlan()
+                await self.event_loop.run_in_executor(None, self.wakeonlan)
             _LOG.debug(
                 "LG %s not connected, retry %s / %s",
                 self._device_config.address,
@@ -438,35 +514,49 @@ class LGDevice:
     async def connect(self):
         """Connect to the device."""
         # pylint: disable = R1702
-        if self._connecting:  # TODO : to confirm or self.state != States.OFF:
+        # another caller is already connecting: do not queue on the lock to run the whole handshake again
+        if self._connecting or self._connect_lock.locked():  # TODO : to confirm or self.state != States.OFF:
             return
-        try:
-            await self._connect_lock.acquire()
-            _LOG.debug("Connect to %s", self._device_config.address)
-            self._connecting = True
-            self._tv: WebOsClient = WebOsClient(host=self._device_config.address, client_key=self._device_config.key)
-            result: bool = await self._tv.connect()
-            if result is None or self._tv.connection is None:
-                _LOG.error("Connection process done but the connection is not available")
-                raise WebOsTvCommandError("Connection process done but the connection is not available")
-            await self._update_states(None)
-            if not self._device_config.mac_address:
-                await self._update_system()
-            await self.register_websocket_events()
-            self._available = True
+        connected = False
+        async with self._connect_lock:
+            try:
+                _LOG.debug("Connect to %s", self._device_config.address)
+                self._connecting = True
+                # keep the current client (and its subscriptions) if it is still connected to the same TV
+                reuse_client = (
+                    self._tv.is_connected()
+                    and self._tv.host == self._device_config.address
+                    and self._tv.client_key == self._device_config.key
+                )
+                if not reuse_client:
+                    self._tv: WebOsClient = WebOsClient(
+                        host=self._device_config.address, client_key=self._device_config.key
+                    )
+                    result: bool = await self._tv.connect()
+                    if result is None or self._tv.connection is None:
+                        _LOG.error("Connection process done but the connection is not available")
+                        raise WebOsTvCommandError("Connection process done but the connection is not available")
+                await self._update_states(None)
+                if not self._device_config.mac_address:
+                    await self._update_system()
+                if not reuse_client:
+                    await self.register_websocket_events()
+                self._available = True
+                connected = True
+            except WEBOSTV_ERRORS as ex:
+                self._available = False
+                _LOG.error("Unable to connect : %s", ex)
+                if not self._connect_task:
+                    _LOG.warning("Unable to update, LG TV probably off: %s, running connect task", ex)
+                    self._connect_task = self.event_loop.create_task(self._connect_loop())
+            finally:
+                # Always emit connected event even if the device is unreachable (off)
+                self.events.emit(Events.CONNECTED, self.id)
+                self._connecting = False
+                _LOG.debug("Connection task ends")
+        # replay the buffered commands once the lock is released so that other callers are not blocked
+        if connected:
             await self._run_buffered_commands()
-        except WEBOSTV_EXCEPTIONS as ex:
-            self._available = False
-            _LOG.error("Unable to connect : %s", ex)
-            if not self._connect_task:
-                _LOG.warning("Unable to update, LG TV probably off: %s, running connect task", ex)
-                self._connect_task = asyncio.create_task(self._connect_loop())
-        finally:
-            # Always emit connected event even if the device is unreachable (off)
-            self.events.emit(Events.CONNECTED, self.id)
-            self._connecting = False
-            _LOG.debug("Connection task ends")
-            self._connect_lock.release()
 
     async def reconnect(self):
         """Occurs when the TV has been turned off and on : the client has to be reset."""
@@ -476,24 +566,27 @@ class LGDevice:
             pass
 
     async def _update_system(self) -> None:
-        info = await self._tv.get_system_info()
-        self._model_name = info.get("modelName")
-        self._serial_number = info.get("serialNumber")
-        info = await self._tv.get_software_info()
-        self._device_config.mac_address = info.get("device_id")
+        system_info, software_info = await asyncio.gather(self._tv.get_system_info(), self._tv.get_software_info())
+        self._model_name = system_info.get("modelName")
+        self._serial_number = system_info.get("serialNumber")
+        self._device_config.mac_address = software_info.get("device_id")
 
     async def disconnect(self):
         """Disconnect from TV."""
         _LOG.debug("Disconnect %s", self.id)
+        connect_task, self._connect_task = self._connect_task, None
+        if connect_task:
+            connect_task.cancel()
         try:
             await self._tv.disconnect()
-            if self._connect_task:
-                self._connect_task.cancel()
-        except WEBOSTV_EXCEPTIONS as ex:
+        except WEBOSTV_ERRORS as ex:
             _LOG.error("Unable to update: %s", ex)
             self._available = False
-        finally:
-            self._connect_task = None
+        # wait for the reconnection loop to end so that it cannot reconnect after the disconnection:
+        # asyncio.wait does not raise the cancellation of the loop, only the one of the caller
+        if connect_task and connect_task is not asyncio.current_task():
+            await asyncio.wait({connect_task})
+        self.events.emit(Events.DISCONNECTED, self.id)
 
     @property
     def unique_id(self) -> str:
@@ -512,12 +605,13 @@ class LGDevice:
             MediaAttr.MEDIA_TITLE: self.media_title,
             MediaAttr.SOUND_MODE_LIST: self.sound_outputs,
         }
-        if self.source_list:
-            updated_data[MediaAttr.SOURCE_LIST] = self.source_list
-        if self.source:
-            updated_data[MediaAttr.SOURCE] = self.source
-        if self.sound_output:
-            updated_data[MediaAttr.SOUND_MODE] = self.sound_output
+        # read each optional property once: sound_output looks up the mapping
+        if source_list := self.source_list:
+            updated_data[MediaAttr.SOURCE_LIST] = source_list
+        if source := self.source:
+            updated_data[MediaAttr.SOURCE] = source
+        if sound_output := self.sound_output:
+            updated_data[MediaAttr.SOUND_MODE] = sound_output
         return updated_data
 
     @property
@@ -543,14 +637,14 @@ class LGDevice:
         return self._attr_state
 
     @property
-    def supported_features(self) -> list[Features]:
+    def supported_features(self) -> tuple[Features, ...]:
         """Return supported features."""
         return self._supported_features
 
     @property
     def source_list(self) -> list[str]:
         """Return a list of available input sources."""
-        return sorted(self._sources)
+        return self._sorted_sources
 
     @property
     def source(self) -> str:
@@ -560,12 +654,7 @@ class LGDevice:
     @property
     def sound_output(self) -> str | None:
         """Return the current sound output."""
-        if self._sound_output is None:
-            return None
-        _sound_output = LG_SOUND_OUTPUTS.get(self._sound_output, None)
-        if _sound_output is None:
-            _LOG.error("Unknown sound output %s, report to developer", self._sound_output)
-        return _sound_output
+        return self._sound_output_label
 
     @property
     def sound_outputs(self) -> [str]:
@@ -609,9 +698,6 @@ class LGDevice:
     def wakeonlan(self) -> None:
         """Send WOL command. to known mac addresses."""
         messages = []
-        wol_port = self._device_config.wol_port
-        if wol_port is None:
-            wol_port = 9
         if self._device_config.mac_address is not None:
             _LOG.debug("LG TV power on : sending magic packet to %s (wired)",
                        self._device_config.mac_address)
@@ -623,14 +709,12 @@ class LGDevice:
             messages.append(create_magic_packet(self._device_config.mac_address2))
 
         if len(messages) > 0:
-            broadcast = "<broadcast>"
-            if self._device_config.broadcast is not None and self._device_config.broadcast != "255.255.255.255":
-                broadcast = self._device_config.broadcast
-            socket_instance = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            socket_instance.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            for msg in messages:
-                socket_instance.sendto(msg, (broadcast, wol_port))
-            socket_instance.close()
+            # one socket per request: it may be sent concurrently from executor threads (power on, connect loop)
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                destination = self._wol_destination
+                for msg in messages:
+                    sock.sendto(msg, destination)
 
 
     async def check_connect(self) -> LGState:
@@ -640,21 +724,21 @@ class LGDevice:
             async with asyncio.timeout(5):
                 state = await self._tv.get_power_state()
                 state_value = state.get("state", None)
-                if state_value is None or state_value == "Unknown":
-                    if self._tv.current_app_id in [None, ""]:
+                if state_value in _UNKNOWN_POWER_STATES:
+                    if self._tv.current_app_id in _NO_APP_IDS:
                         _LOG.debug("TV is already off [%s]", state)
                         lg_state = LGState.OFF
-                elif state_value in ["Power Off", "Suspend", "Active Standby"]:
+                elif state_value in _STANDBY_POWER_STATES:
                     _LOG.debug("TV is in standby [%s]", state)
                     lg_state = LGState.STANDBY
-        except Exception as ex:
-            _LOG.debug("Could not get TV state, assuming off", ex)
+        except WEBOSTV_ERRORS as ex:
+            _LOG.debug("Could not get TV state, assuming off %s", ex)
             lg_state = LGState.OFF
         if lg_state == LGState.OFF:
             _LOG.debug("TV is not connected, calling connect")
             if not self._connect_task:
                 _LOG.warning("Unable to update, LG TV probably off, running connect task")
-                self._connect_task = asyncio.create_task(self._connect_loop())
+                self._connect_task = self.event_loop.create_task(self._connect_loop())
         else:
             _LOG.debug("TV is connected")
         return lg_state
@@ -673,18 +757,15 @@ class LGDevice:
                 self._device_config.wol_port,
                 ip_address
             )
-            self.wakeonlan()
+            # blocking socket calls: keep them off the event loop
+            await self.event_loop.run_in_executor(None, self.wakeonlan)
             self._retry_wakeonlan = True
-            self._buffered_callbacks[time.time()] = {
-                "object": self,
-                "function": self._tv.power_on,
-                "args": [],
-            }
-            self.event_loop.create_task(self.check_connect())
+            self.buffer_command(LGDevice.power_on_deferred)
+            self._create_task(self.check_connect())
             try:
                 _LOG.debug("Sends power on command in case of TV is already connected")
                 await self._tv.power_on()
-            except Exception as ex:
+            except WEBOSTV_ERRORS as ex:
                 _LOG.error("LG TV error power on command %s", ex)
             return ucapi.StatusCodes.OK
         except WEBOSTV_EXCEPTIONS as ex:
@@ -695,6 +776,10 @@ class LGDevice:
         # return ucapi.StatusCodes.BAD_REQUEST
         return ucapi.StatusCodes.OK
 
+    async def power_on_deferred(self):
+        """Send power-on command to the current TV client."""
+        await self._tv.power_on()
+
     async def power_off_deferred(self):
         # Sleep time : sometimes the connection variable is not defined although the lib reports the TV as connected
         if self._tv.connection is None:
@@ -706,17 +791,18 @@ class LGDevice:
         """Send power-off command to LG TV."""
         _LOG.debug("Power off")
         self._retry_wakeonlan = False
-        lg_state = await self.check_connect()
-        if lg_state == LGState.ON:
-            _LOG.debug("TV is ON, powering off [%s]", lg_state)
-            await self._tv.command("request", endpoints.POWER_OFF)
-        else:
-            _LOG.debug("Power off command : TV seems to be off, adding power_off call to buffered commands if connection is reestablished")
-            self._buffered_callbacks[time.time()] = {
-                "object": self,
-                "function": LGDevice.power_off_deferred,
-                "args": [],
-            }
+        # single deadline for the power state probe and the power off command
+        async with asyncio.timeout(POWER_OFF_TIMEOUT):
+            lg_state = await self.check_connect()
+            if lg_state == LGState.ON:
+                _LOG.debug("TV is ON, powering off [%s]", lg_state)
+                await self._tv.command("request", endpoints.POWER_OFF)
+            else:
+                _LOG.debug(
+                    "Power off command : TV seems to be off, "
+                    "adding power_off call to buffered commands if connection is reestablished"
+                )
+                self.buffer_command(LGDevice.power_off_deferred)
 
     @retry()
     async def set_volume_level(self, volume: float | None):
@@ -725,7 +811,7 @@ class LGDevice:
             return ucapi.StatusCodes.BAD_REQUEST
         _LOG.debug("LG TV setting volume to %s", volume)
         await self._tv.set_volume(int(round(volume)))
-        self.events.emit(Events.UPDATE, self.id, {MediaAttr.VOLUME: volume})
+        self._emit_update({MediaAttr.VOLUME: volume})
 
     @retry()
     async def volume_up(self):
@@ -816,28 +902,24 @@ class LGDevice:
     async def select_source_next(self) -> ucapi.StatusCodes:
         if self._tv is None:
             return ucapi.StatusCodes.SERVICE_UNAVAILABLE
-        sources:list[dict] = list(self._tv.inputs.values())
-        current_source = self.source
-        if not sources or len(sources) == 0:
+        input_ids = self._input_ids
+        if not input_ids:
             _LOG.error("LG TV next input command : sources list is not feed yet")
             return ucapi.StatusCodes.SERVICE_UNAVAILABLE
-        if not current_source:
-            current_source = sources[0]["id"]
-        else:
-            try:
-                source = [source for source in sources if source["id"] == current_source]
-                if len(source) > 0:
-                    source = source[0]
-                else:
-                    source = None
-                index = sources.index(source)
-                index += 1
-                if index >= len(sources):
-                    index = 0
-                current_source = sources[index]["id"]
-            except (ValueError, AttributeError):
-                current_source = sources[0]["id"]
-        return await self.select_source(current_source)
+        # next input after the current one, the first input if the current source is not an input
+        index = self._input_positions.get(self.source, -1) + 1
+        return await self.select_source(input_ids[index % len(input_ids)])
+
+    async def _power_on_and_buffer(self, function: Callable[..., Awaitable[Any]], *args) -> ucapi.StatusCodes:
+        """Power on the TV and buffer the given LGDevice method call until the connection is established."""
+        await self.power_on()
+        self.buffer_command(function, *args)
+        _LOG.info(
+            "Device is not ready to accept command, buffering it : %s",
+            self._buffered_callbacks,
+        )
+        self._create_task(self.reconnect())
+        return ucapi.StatusCodes.OK
 
     async def select_source(self, source: str | None, delay: int = 0) -> ucapi.StatusCodes:
         """Send input_source command to LG TV."""
@@ -851,25 +933,9 @@ class LGDevice:
                 raise WebOsTvCommandError
             return res
         except WebOsTvCommandError:
-            await self.power_on()
-            if launch_app:
-                self._buffered_callbacks[time.time()] = {
-                    "object": self,
-                    "function": LGDevice.select_source_deferred,
-                    "args": [source, INIT_APPS_LAUNCH_DELAY],
-                }
-            else:
-                self._buffered_callbacks[time.time()] = {
-                    "object": self,
-                    "function": LGDevice.select_source_deferred,
-                    "args": [source, 0],
-                }
-            _LOG.info(
-                "Device is not ready to accept command, buffering it : %s",
-                self._buffered_callbacks,
+            return await self._power_on_and_buffer(
+                LGDevice.select_source_deferred, source, INIT_APPS_LAUNCH_DELAY if launch_app else 0
             )
-            self.event_loop.create_task(self.reconnect())
-            return ucapi.StatusCodes.OK
         except WEBOSTV_EXCEPTIONS as ex:
             _LOG.error("LG TV error select_source %s", ex)
         # pylint: disable = W0718
@@ -888,10 +954,9 @@ class LGDevice:
         if mode is None:
             return ucapi.StatusCodes.BAD_REQUEST
         _LOG.debug("LG TV setting sound output to %s", mode)
-        inv_map = {v: k for k, v in LG_SOUND_OUTPUTS.items()}
-        sound_output = inv_map.get(mode)
+        sound_output = _SOUND_OUTPUTS_BY_LABEL.get(mode)
         if sound_output is None:
-            _LOG.debug("LG TV invalid sound output %s from list (%s)", mode, inv_map)
+            _LOG.debug("LG TV invalid sound output %s from list (%s)", mode, _SOUND_OUTPUTS_BY_LABEL)
             return ucapi.StatusCodes.BAD_REQUEST
         try:
             res = await self.select_sound_output_deferred(sound_output)
@@ -899,18 +964,7 @@ class LGDevice:
                 raise WebOsTvCommandError
             return res
         except WebOsTvCommandError:
-            await self.power_on()
-            self._buffered_callbacks[time.time()] = {
-                "object": self,
-                "function": LGDevice.select_sound_output_deferred,
-                "args": [sound_output],
-            }
-            _LOG.info(
-                "Device is not ready to accept command, buffering it : %s",
-                self._buffered_callbacks,
-            )
-            self.event_loop.create_task(self.reconnect())
-            return ucapi.StatusCodes.OK
+            return await self._power_on_and_buffer(LGDevice.select_sound_output_deferred, sound_output)
         except WEBOSTV_EXCEPTIONS as ex:
             _LOG.error("LG TV error select_sound_output %s", ex)
         # pylint: disable = W0718
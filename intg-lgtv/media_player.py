@@ -19,7 +19,7 @@ from ucapi.media_player import (
     Options,
     States,
 )
-from const import LG_SIMPLE_COMMANDS, LG_SIMPLE_COMMANDS_CUSTOM
+from const import LG_SIMPLE_COMMANDS, LG_SIMPLE_COMMANDS_CUSTOM, LG_SIMPLE_COMMANDS_ORDERED
 
 _LOG = logging.getLogger(__name__)
 
@@ -46,7 +46,7 @@ class LGTVMediaPlayer(MediaPlayer):
         }
         _LOG.debug("LGTVMediaPlayer init %s : %s", entity_id, attributes)
         options = {
-            Options.SIMPLE_COMMANDS: LG_SIMPLE_COMMANDS
+            Options.SIMPLE_COMMANDS: list(LG_SIMPLE_COMMANDS_ORDERED)
         }
         super().__init__(
             entity_id,
@@ -173,7 +173,7 @@ class LGTVMediaPlayer(MediaPlayer):
             res = await self._device.button("REWIND")
         elif cmd_id == Commands.SELECT_SOUND_MODE:
             res = await self._device.select_sound_output(params.get("mode"))
-        elif cmd_id in self.options[Options.SIMPLE_COMMANDS]:
+        elif cmd_id in LG_SIMPLE_COMMANDS:
             if cmd_id in LG_SIMPLE_COMMANDS_CUSTOM:
                 if cmd_id == "INPUT_SOURCE":
                     res = await self._device.select_source_next()